@@ -16,8 +16,18 @@ import re
 import sys
 import os
 import html
+from itertools import islice
 from typing import List, Dict, Any, Tuple, Optional
 
+import numpy as np
+
+# Optional numba JIT for the per-cell scan kernels (falls back to numpy)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Add current directory to path to import conversion3
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -28,6 +38,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 DEFAULT_DATA_FILE = "/Users/rishabh.singh/Desktop/markdown_filter/filter/data/confluence_markdown.jsonl"
 DEFAULT_TEST_INDEX = 100
 
+# Batch pipelines import this module once per worker; keep the import-time
+# status banner opt-in so quiet runs don't pay for (or log) it
+_VERBOSE = bool(os.environ.get("MARKDOWN_FILTER_VERBOSE"))
+
 # =============================================================================
 #                           CONVERSION MODULE IMPORT
 # =============================================================================
@@ -40,7 +54,8 @@ try:
     from conversion3 import convert_html_to_markdown as conversion3_converter
     convert_html_to_markdown_func = conversion3_converter
     CONVERSION3_AVAILABLE = True
-    print("✅ Using conversion3.py for HTML to Markdown conversion")
+    if _VERBOSE:
+        print("✅ Using conversion3.py for HTML to Markdown conversion")
 except ImportError as e:
     print(f"⚠️ conversion3.py not available: {e}")
     print("🔄 Falling back to basic HTML to Markdown conversion")
@@ -109,7 +124,7 @@ def count_mentions_in_text(text: str) -> Tuple[int, List[str]]:
     """
     if not text:
         return 0, []
-    mentions = re.findall(r"\[~[^\]]+\]", text)
+    mentions = _MENTION_PATTERN.findall(text)
     return len(mentions), mentions
 
 
@@ -179,7 +194,9 @@ def extract_tables_from_markdown(md: str) -> List[List[List[str]]]:
     Each table is a list of rows, each row is a list of cell strings.
     Handles standard and non-standard markdown tables.
     """
-    if not md:
+    if not md or '|' not in md:
+        # Every table row needs a pipe somewhere, so one C-level substring
+        # scan rules out the line-by-line pass for table-free documents
         return []
 
     lines = [line.rstrip() for line in md.splitlines()]
@@ -198,12 +215,19 @@ def extract_tables_from_markdown(md: str) -> List[List[List[str]]]:
     def flush_block():
         nonlocal current_block
         if len(current_block) >= 2:
-            # Check for proper table with separator row
-            has_separator = any(is_separator_row(l) for l in current_block)
+            # Classify each line exactly once: the same pass detects the
+            # separator row and collects the content rows
+            has_separator = False
+            table_lines = []
+            for l in current_block:
+                if not l.strip():
+                    continue
+                if is_separator_row(l):
+                    has_separator = True
+                elif "|" in l:
+                    table_lines.append(l)
             if has_separator:
-                # Filter out separator rows and parse cells
-                table_lines = [l for l in current_block if l.strip() and not is_separator_row(l)]
-                table = [parse_cells(l) for l in table_lines if "|" in l]
+                table = [parse_cells(l) for l in table_lines]
                 if table:
                     tables.append(table)
         current_block = []
@@ -249,10 +273,14 @@ def extract_tables_from_markdown(md: str) -> List[List[List[str]]]:
     for line in lines:
         if is_table_line(line):
             current_block.append(line)
-        else:
+        elif current_block:
+            # Only flush when there's a pending block: most lines in a
+            # document are non-table lines, and the unconditional call paid
+            # a function call per line just to find an empty block
             flush_block()
 
-    flush_block()  # flush last one
+    if current_block:
+        flush_block()  # flush last one
     return tables
 
 
@@ -279,30 +307,38 @@ def find_contiguous_empty_blocks(row_empty_flags: List[bool]) -> List[Dict[str,
     Finds contiguous blocks of empty cells in a row.
     Returns list of dicts with start and end indices.
     """
-    blocks = []
-    start = None
-    for i, flag in enumerate(row_empty_flags):
-        if flag and start is None:
-            start = i
-        if not flag and start is not None:
-            blocks.append({"start": start, "end": i - 1})
-            start = None
-    if start is not None:
-        blocks.append({"start": start, "end": len(row_empty_flags) - 1})
-    return blocks
-
-def detect_table_heading(table: List[List[str]]) -> Dict[str, Any]:
+    flags = np.asarray(row_empty_flags, dtype=bool)
+    if not flags.any():
+        return []
+    # Rising/falling edges of the padded flag signal mark block boundaries
+    padded = np.concatenate(([False], flags, [False]))
+    edges = np.diff(padded.astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return [{"start": int(s), "end": int(e)} for s, e in zip(starts, ends)]
+
+# Heading type by flag bits: index = 2 * has_row_headers + has_column_headers
+_HEADING_TYPES = ("none", "column", "row", "both")
+
+def detect_table_heading(table: List[List[str]],
+                         norm_table: Optional[List[List[str]]] = None,
+                         cols: Optional[int] = None) -> Dict[str, Any]:
     """
     Detect table headers based purely on bold markdown syntax (**xyz**).
     Rules:
       - The *entire* first row must be bold to count as column headers.
       - The *entire* first column must be bold to count as row headers.
       - If both are bold, (0,0) cell is ignored for row headers.
+    Callers that already normalized the table (analyze_table_content) can pass
+    norm_table/cols to skip re-normalizing it here; norm_table must be
+    rectangular with every row padded to cols, as the per-row scans below
+    rely on it and carry no ragged-row guards.
     Returns:
       {
         "column_headers": list or None,
         "row_headers": list or None,
-        "heading_type": "row" | "column" | "both" | "none"
+        "heading_type": "row" | "column" | "both" | "none",
+        "heading_flags": int (bit 1 = column headers, bit 2 = row headers)
       }
     """
 
@@ -310,21 +346,25 @@ def detect_table_heading(table: List[List[str]]) -> Dict[str, Any]:
         return {
             "column_headers": None,
             "row_headers": None,
-            "heading_type": "none"
+            "heading_type": "none",
+            "heading_flags": 0
         }
 
     rows = len(table)
-    cols = max((len(r) for r in table), default=0)
-    
+    if cols is None:
+        cols = max((len(r) for r in table), default=0)
+
     if rows == 0 or cols == 0:
         return {
             "column_headers": None,
             "row_headers": None,
-            "heading_type": "none"
+            "heading_type": "none",
+            "heading_flags": 0
         }
-    
-    # Normalize all rows to same length
-    norm_table = [r + [""] * (cols - len(r)) for r in table]
+
+    if norm_table is None:
+        # Normalize all rows to same length
+        norm_table = [r + [""] * (cols - len(r)) for r in table]
 
     bold_pattern = re.compile(r"^\s*\*\*(.+?)\*\*\s*$")
 
@@ -342,12 +382,17 @@ def detect_table_heading(table: List[List[str]]) -> Dict[str, Any]:
         return match.group(1).strip() if match else cell.strip()
 
     # --- Check if all non-empty cells in first row are bold ---
+    # Strip each first-row cell once; the stripped copies feed both the bold
+    # check here and the non-bold header heuristic below, which used to
+    # re-strip the row in a second pass
     first_row = norm_table[0]
-    non_empty_first_row = [c for c in first_row if c.strip()]
+    first_row_stripped = [c.strip() for c in first_row]
+    non_empty_first_row = [c for c in first_row_stripped if c]
     all_first_row_bold = len(non_empty_first_row) > 0 and all(is_bold_cell(c) for c in non_empty_first_row)
 
     # --- Check if all non-empty cells in first column are bold ---
-    first_col = [r[0] for r in norm_table if r]
+    # (cols >= 1 and rows are padded, so r[0] always exists)
+    first_col = [r[0] for r in norm_table]
     non_empty_first_col = [c for c in first_col if c.strip()]
     all_first_col_bold = len(non_empty_first_col) > 0 and all(is_bold_cell(c) for c in non_empty_first_col)
 
@@ -356,14 +401,16 @@ def detect_table_heading(table: List[List[str]]) -> Dict[str, Any]:
     # treat first column as row headers even if not bold
     is_key_value_table = False
     if cols == 2 and not all_first_col_bold and not all_first_row_bold:
-        # Check if first column has content and second column is mostly empty
-        second_col = [r[1] if len(r) > 1 else "" for r in norm_table]
-        first_col_filled = sum(1 for c in first_col if c.strip())
-        second_col_filled = sum(1 for c in second_col if c.strip())
-        
+        # First-column fill count is already known from the bold check above;
+        # check its threshold first so the second column is only scanned when
+        # the first column actually qualifies
+        first_col_filled = len(non_empty_first_col)
+
         # If first column is mostly filled and second column is mostly empty, it's key-value
-        if first_col_filled >= rows * 0.5 and second_col_filled <= rows * 0.5:
-            is_key_value_table = True
+        if first_col_filled >= rows * 0.5:
+            second_col_filled = sum(1 for r in norm_table if r[1].strip())
+            if second_col_filled <= rows * 0.5:
+                is_key_value_table = True
 
     # --- Extract column headers (if full first row is bold) ---
     if all_first_row_bold:
@@ -389,9 +436,8 @@ def detect_table_heading(table: List[List[str]]) -> Dict[str, Any]:
     if not column_headers and rows >= 1:
         first_row_looks_like_headers = True
         non_empty_cells = 0
-        
-        for cell in first_row:
-            cell_stripped = cell.strip()
+
+        for cell_stripped in first_row_stripped:
             if not cell_stripped:  # Empty cells in header are okay
                 continue
             
@@ -411,75 +457,103 @@ def detect_table_heading(table: List[List[str]]) -> Dict[str, Any]:
         # Need at least 2 non-empty cells to be a valid header row
         # If first row looks like headers, treat it as column headers
         if first_row_looks_like_headers and non_empty_cells >= 2:
-            column_headers = [c.strip() for c in first_row]
-
-    # --- Determine heading type ---
-    if column_headers and row_headers:
-        heading_type = "both"
-    elif column_headers:
-        heading_type = "column"
-    elif row_headers:
-        heading_type = "row"
-    else:
-        heading_type = "none"
+            column_headers = first_row_stripped
+
+    # --- Determine heading type (branchless flag-bit lookup) ---
+    # The bitfield doubles as the type-tuple index and lets consumers test
+    # for column/row headers with a mask instead of string comparisons
+    heading_flags = 2 * bool(row_headers) + bool(column_headers)
+    heading_type = _HEADING_TYPES[heading_flags]
 
     return {
         "column_headers": column_headers,
         "row_headers": row_headers,
         "heading_type": heading_type,
+        "heading_flags": heading_flags,
         "is_key_value_table": is_key_value_table
     }
 
 
 
+# Placeholder words that don't contribute meaningful content
+PLACEHOLDER_WORDS = frozenset({
+    'draft', 'tbd', 'yes', 'no', 'none', 'n/a', 'na', 'todo', 'pending',
+    'ok', 'done', 'wip', 'placeholder', 'example', 'sample', 'test',
+    'tmp', 'temp', 'xxx', 'yyy', 'zzz', 'abc', 'tba', 'high', 'low', 'medium',
+    'medium-high', 'medium-low', 'high-medium', 'low-medium', 'high-low', 'low-high',
+    'status',  # Status indicators like [STATUS: DRAFT]
+})
+
+# Precompiled patterns for the per-cell scanning kernel
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+_LINK_PATTERN = re.compile(r"https?://[^\s)]+")
+_IMAGE_PATTERN = re.compile(r"\b\S+\.(png|jpg|jpeg|gif|svg|bmp|webp)\b", re.I)
+_FILE_PATTERN = re.compile(r"\b\S+\.(pdf|docx?|xlsx?|csv|pptx?)\b", re.I)
+_MENTION_PATTERN = re.compile(r"\[~[^\]]+\]")
+_ROMAN_NUMERAL_PATTERN = re.compile(r'^m{0,4}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})$')
+
+_ROMAN_CHARS = frozenset('ivxlcdm')
+
+
+def is_index_pattern(word: str) -> bool:
+    """
+    Check if a word is an index/counter (numeric, roman numeral, or alphabetic).
+    Returns True for: 1, 2, 100, i, ii, iii, iv, v, x, a, b, c, aa, bb, etc.
+    """
+    word_clean = word.strip().lower()
+
+    # Pure numeric (1, 2, 10, 100, etc.)
+    if word_clean.isdigit():
+        return True
+
+    # Roman numerals (i, ii, iii, iv, v, vi, vii, viii, ix, x, xi, xii, etc.)
+    # Common pattern: only contains i, v, x, l, c, d, m
+    if word_clean and all(c in _ROMAN_CHARS for c in word_clean):
+        # Additional check: valid roman numeral patterns
+        if _ROMAN_NUMERAL_PATTERN.fullmatch(word_clean):
+            return True
+
+    # Single alphabetic character (a, b, c, ..., z)
+    if len(word_clean) == 1 and word_clean.isalpha():
+        return True
+
+    # Repeated alphabetic character (aa, bb, cc, etc.)
+    if len(word_clean) <= 3 and word_clean and all(c == word_clean[0] for c in word_clean) and word_clean[0].isalpha():
+        return True
+
+    return False
+
+
 def cell_metrics(cell_text: str) -> Dict[str, Any]:
     """
     Analyze a single cell text for emptiness, words, links, images, files, and mentions.
     Classifies words into meaningful vs placeholder/index categories.
     """
-    # Define placeholder words that don't contribute meaningful content
-    PLACEHOLDER_WORDS = {
-        'draft', 'tbd', 'yes', 'no', 'none', 'n/a', 'na', 'todo', 'pending',
-        'ok', 'done', 'wip', 'placeholder', 'example', 'sample', 'test',
-        'tmp', 'temp', 'xxx', 'yyy', 'zzz', 'abc', 'tba', 'high', 'low', 'medium', 
-        'medium-high', 'medium-low', 'high-medium', 'low-medium', 'high-low', 'low-high',
-        'status',  # Status indicators like [STATUS: DRAFT]
-    }
-    
-    def is_index_pattern(word: str) -> bool:
-        """
-        Check if a word is an index/counter (numeric, roman numeral, or alphabetic).
-        Returns True for: 1, 2, 100, i, ii, iii, iv, v, x, a, b, c, aa, bb, etc.
-        """
-        word_clean = word.strip().lower()
-        
-        # Pure numeric (1, 2, 10, 100, etc.)
-        if word_clean.isdigit():
-            return True
-        
-        # Roman numerals (i, ii, iii, iv, v, vi, vii, viii, ix, x, xi, xii, etc.)
-        # Common pattern: only contains i, v, x, l, c, d, m
-        if word_clean and all(c in 'ivxlcdm' for c in word_clean):
-            # Additional check: valid roman numeral patterns
-            if re.fullmatch(r'^m{0,4}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})$', word_clean):
-                return True
-        
-        # Single alphabetic character (a, b, c, ..., z)
-        if len(word_clean) == 1 and word_clean.isalpha():
-            return True
-        
-        # Repeated alphabetic character (aa, bb, cc, etc.)
-        if len(word_clean) <= 3 and word_clean and all(c == word_clean[0] for c in word_clean) and word_clean[0].isalpha():
-            return True
-        
-        return False
-    
     text = cell_text or ""
     stripped = text.strip()
-    is_empty = (len(stripped) == 0)
+
+    # Fast path: blank cells are common in sparse tables and need no
+    # regex scanning at all
+    if not stripped:
+        return {
+            "text": text,
+            "words": 0,
+            "meaningful_words": 0,
+            "placeholder_words": 0,
+            "meaningful_word_list": [],
+            "placeholder_word_list": [],
+            "index_word_list": [],
+            "links": 0,
+            "images": 0,
+            "files": 0,
+            "mentions": 0,
+            "mention_list": [],
+            "empty": True,
+            "has_useful_content": False
+        }
 
     # Extract all words
-    all_words = re.findall(r'\b\w+\b', text) if not is_empty else []
+    all_words = _WORD_PATTERN.findall(text)
     total_words = len(all_words)
     
     # Classify words as meaningful, placeholder, or index
@@ -504,9 +578,9 @@ def cell_metrics(cell_text: str) -> Dict[str, Any]:
     placeholder_word_count = len(placeholder_words) + len(index_words)  # Count indices as placeholders
     
     # Extract other metrics
-    links = len(re.findall(r"https?://[^\s)]+", text))
-    images = len(re.findall(r"\b\S+\.(png|jpg|jpeg|gif|svg|bmp|webp)\b", text, re.I))
-    files = len(re.findall(r"\b\S+\.(pdf|docx?|xlsx?|csv|pptx?)\b", text, re.I))
+    links = len(_LINK_PATTERN.findall(text))
+    images = len(_IMAGE_PATTERN.findall(text))
+    files = len(_FILE_PATTERN.findall(text))
     mention_count, mentions = count_mentions_in_text(text)
 
     return {
@@ -522,11 +596,106 @@ def cell_metrics(cell_text: str) -> Dict[str, Any]:
         "files": files,
         "mentions": mention_count,
         "mention_list": mentions,
-        "empty": is_empty,
+        "empty": False,
         "has_useful_content": meaningful_word_count >= 2 or links > 0 or images > 0 or files > 0 or mention_count > 0
     }
 
 
+# Numeric per-cell metrics mirrored into the SoA layout
+_SOA_METRIC_KEYS = ('words', 'meaningful_words', 'placeholder_words',
+                    'links', 'images', 'files', 'mentions')
+
+
+def _grid_to_soa(cell_metrics_grid: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Mirror the per-cell metrics grid (list of lists of dicts) into a dict of
+    parallel int32 arrays, one [rows, cols] array per numeric metric.
+    int32 is narrow enough to keep the vectorized scans memory-light while
+    still holding any real per-cell count (int16 overflows on large dump
+    cells with tens of thousands of words).
+
+    Struct-of-arrays layout keeps each metric contiguous in memory, so
+    downstream checks can run vectorized numpy reductions instead of
+    re-walking the dict grid cell by cell.
+    """
+    return {
+        key: np.array(
+            [[cm[key] for cm in row] for row in cell_metrics_grid],
+            dtype=np.int32,
+        )
+        for key in _SOA_METRIC_KEYS
+    }
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _useful_scan_kernel(mw, links, images, files, mentions):
+        """JIT-compiled usefulness scan; exits on the first useful cell."""
+        rows, cols = mw.shape
+        for r in range(rows):
+            for c in range(cols):
+                if (mw[r, c] >= 2 or links[r, c] > 0 or images[r, c] > 0
+                        or files[r, c] > 0 or mentions[r, c] > 0):
+                    return True
+        return False
+
+    @njit(cache=True)
+    def _empty_structure_kernel(empty):
+        """JIT-compiled fused scan of the empty mask: filled-cell count plus
+        all-empty flags per row and per column, in a single pass."""
+        rows, cols = empty.shape
+        filled = 0
+        row_all_empty = np.ones(rows, dtype=np.bool_)
+        col_all_empty = np.ones(cols, dtype=np.bool_)
+        for r in range(rows):
+            for c in range(cols):
+                if not empty[r, c]:
+                    filled += 1
+                    row_all_empty[r] = False
+                    col_all_empty[c] = False
+        return filled, row_all_empty, col_all_empty
+
+    @njit(cache=True)
+    def _row_sums_kernel(words, mw, ph, links, images, files, mentions, data_c0):
+        """JIT-compiled fused per-row sums: the word metrics over the data
+        columns and the link/image/file/mention metrics over every column,
+        all seven accumulated in a single pass over the SoA arrays."""
+        rows, cols = words.shape
+        sums = np.zeros((7, rows), dtype=np.int64)
+        for r in range(rows):
+            for c in range(cols):
+                if c >= data_c0:
+                    sums[0, r] += words[r, c]
+                    sums[1, r] += mw[r, c]
+                    sums[2, r] += ph[r, c]
+                sums[3, r] += links[r, c]
+                sums[4, r] += images[r, c]
+                sums[5, r] += files[r, c]
+                sums[6, r] += mentions[r, c]
+        return sums
+
+
+def _region_has_useful_content(cell_soa: Dict[str, Any], r0: int, c0: int) -> bool:
+    """
+    Check whether any cell in the data region [r0:, c0:] has useful content
+    (meaningful words >= 2, or any link/image/file/mention).
+
+    Uses the numba-compiled kernel when available (early exit, machine code);
+    otherwise falls back to the vectorized numpy mask.
+    """
+    mw = cell_soa['meaningful_words'][r0:, c0:]
+    links = cell_soa['links'][r0:, c0:]
+    images = cell_soa['images'][r0:, c0:]
+    files = cell_soa['files'][r0:, c0:]
+    mentions = cell_soa['mentions'][r0:, c0:]
+
+    if NUMBA_AVAILABLE:
+        return bool(_useful_scan_kernel(mw, links, images, files, mentions))
+
+    useful_mask = (mw >= 2) | (links > 0) | (images > 0) | (files > 0) | (mentions > 0)
+    return bool(useful_mask.any())
+
+
 def analyze_table_content(table: List[List[str]], label_col_count: int = 1) -> Dict[str, Any]:
     """
     Analyzes the table content and returns comprehensive statistics.
@@ -562,6 +731,7 @@ def analyze_table_content(table: List[List[str]], label_col_count: int = 1) -> D
             "empty_columns": [],
             "per_row_summaries": [],
             "cell_metrics_grid": [],
+            "cell_soa": {},
             "is_empty_table": True,
             "is_useful_table": False,
             "headings": None,
@@ -574,123 +744,128 @@ def analyze_table_content(table: List[List[str]], label_col_count: int = 1) -> D
     norm_table = [row + [""] * (cols - len(row)) for row in table]
 
     # Detect headers first to exclude them from word count
-    headings = detect_table_heading(table)
-    heading_type = headings.get("heading_type", "none")
-    
-    # Determine which cells are headers
-    has_column_headers = heading_type in ["column", "both"]
-    has_row_headers = heading_type in ["row", "both"]
+    # (pass the normalized table so it isn't normalized twice)
+    headings = detect_table_heading(table, norm_table=norm_table, cols=cols)
+
+    # Determine which cells are headers via the precomputed bitfield instead
+    # of string membership tests against heading_type
+    heading_flags = headings.get("heading_flags", 0)
+    has_column_headers = bool(heading_flags & 1)
+    has_row_headers = bool(heading_flags & 2)
 
     total_cells = rows * cols
-    filled_cells = 0
-    
-    # Word counts (excluding headings)
-    total_words = 0
-    meaningful_words_count = 0
-    placeholder_words_count = 0
-    
-    # Other metrics
-    total_links = 0
-    total_images = 0
-    total_files = 0
-    total_mentions = 0
 
     empty_cell_coords = []
-    per_col_empty_counts = [0] * cols
     per_row_summaries = []
     cell_metrics_grid = []
-    
-    # Track if table has any useful content
-    has_any_useful_content = False
+
+    # Preallocated boolean mask written in place during the scan, instead of
+    # per-row Python lists converted to an array afterwards
+    empty_mask = np.zeros((rows, cols), dtype=bool)
 
     for r_idx, row in enumerate(norm_table):
         row_metrics = []
-        row_word_sum = 0
-        row_meaningful_words = 0
-        row_placeholder_words = 0
-        row_links = 0
-        row_images = 0
-        row_files = 0
-        row_mentions = 0
-        row_empty_flags = []
 
         for c_idx, cell in enumerate(row):
             cm = cell_metrics(cell)
             row_metrics.append(cm)
 
-            # Determine if this cell is a header cell
-            is_header_cell = False
-            if has_column_headers and r_idx == 0:
-                # First row is column header
-                is_header_cell = True
-            if has_row_headers and c_idx == 0:
-                # First column is row header
-                is_header_cell = True
-
-            # Count words only for non-header cells (data cells)
-            if not is_header_cell:
-                total_words += cm["words"]
-                meaningful_words_count += cm["meaningful_words"]
-                placeholder_words_count += cm["placeholder_words"]
-                row_word_sum += cm["words"]
-                row_meaningful_words += cm["meaningful_words"]
-                row_placeholder_words += cm["placeholder_words"]
-                
-                # Check if this cell has useful content
-                if cm["has_useful_content"]:
-                    has_any_useful_content = True
-            
-            # Count other metrics for all cells (including headers for completeness)
-            total_links += cm["links"]
-            total_images += cm["images"]
-            total_files += cm["files"]
-            total_mentions += cm["mentions"]
-
             if cm["empty"]:
                 empty_cell_coords.append((r_idx, c_idx))
-                per_col_empty_counts[c_idx] += 1
-                row_empty_flags.append(True)
-            else:
-                filled_cells += 1
-                row_empty_flags.append(False)
-
-            row_links += cm["links"]
-            row_images += cm["images"]
-            row_files += cm["files"]
-            row_mentions += cm["mentions"]
+                empty_mask[r_idx, c_idx] = True
 
-        empty_blocks = find_contiguous_empty_blocks(row_empty_flags)
+        cell_metrics_grid.append(row_metrics)
 
+    # SoA mirror of the grid for vectorized downstream consumers
+    cell_soa = _grid_to_soa(cell_metrics_grid)
+
+    # Usefulness check over the data region (header row/column excluded)
+    data_r0 = 1 if has_column_headers else 0
+    data_c0 = 1 if has_row_headers else 0
+    has_any_useful_content = _region_has_useful_content(cell_soa, data_r0, data_c0)
+
+    # Totals as single C-level reductions over the SoA arrays: word counts
+    # over the data region only (headings excluded), link/image/file/mention
+    # counts over every cell (including headers for completeness)
+    total_words = int(cell_soa['words'][data_r0:, data_c0:].sum())
+    meaningful_words_count = int(cell_soa['meaningful_words'][data_r0:, data_c0:].sum())
+    placeholder_words_count = int(cell_soa['placeholder_words'][data_r0:, data_c0:].sum())
+    total_links = int(cell_soa['links'].sum())
+    total_images = int(cell_soa['images'].sum())
+    total_files = int(cell_soa['files'].sum())
+    total_mentions = int(cell_soa['mentions'].sum())
+
+    # Per-row word sums as sliced row reductions over the SoA arrays; the
+    # header row/column contributes nothing, matching the per-cell exclusion
+    # this replaces
+    if NUMBA_AVAILABLE:
+        # Fused kernel: all seven per-row sums in one pass over the SoA
+        row_sums = _row_sums_kernel(
+            cell_soa['words'], cell_soa['meaningful_words'],
+            cell_soa['placeholder_words'], cell_soa['links'],
+            cell_soa['images'], cell_soa['files'], cell_soa['mentions'],
+            data_c0,
+        )
+        (words_per_row, mw_per_row, ph_per_row, links_per_row,
+         images_per_row, files_per_row, mentions_per_row) = row_sums
+    else:
+        words_per_row = cell_soa['words'][:, data_c0:].sum(axis=1)
+        mw_per_row = cell_soa['meaningful_words'][:, data_c0:].sum(axis=1)
+        ph_per_row = cell_soa['placeholder_words'][:, data_c0:].sum(axis=1)
+
+        # Per-row link/image/file/mention counts cover every cell (headers
+        # included), as single axis reductions instead of Python accumulators
+        # inside the scan loop
+        links_per_row = cell_soa['links'].sum(axis=1)
+        images_per_row = cell_soa['images'].sum(axis=1)
+        files_per_row = cell_soa['files'].sum(axis=1)
+        mentions_per_row = cell_soa['mentions'].sum(axis=1)
+
+    if data_r0:
+        words_per_row[0] = 0
+        mw_per_row[0] = 0
+        ph_per_row[0] = 0
+
+    # Per-row empty-cell counts in one axis reduction instead of a .sum()
+    # call per row inside the summary loop
+    empty_per_row = empty_mask.sum(axis=1)
+
+    for r_idx in range(rows):
+        row_empty_flags = empty_mask[r_idx]
         per_row_summaries.append({
             "row_index": r_idx,
-            "cols": len(row),
-            "word_count": row_word_sum,
-            "meaningful_words": row_meaningful_words,
-            "placeholder_words": row_placeholder_words,
-            "links": row_links,
-            "images": row_images,
-            "files": row_files,
-            "mentions": row_mentions,
-            "empty_cell_count": sum(row_empty_flags),
-            "empty_blocks": empty_blocks,
-            "cell_metrics": row_metrics
+            "cols": cols,
+            "word_count": int(words_per_row[r_idx]),
+            "meaningful_words": int(mw_per_row[r_idx]),
+            "placeholder_words": int(ph_per_row[r_idx]),
+            "links": int(links_per_row[r_idx]),
+            "images": int(images_per_row[r_idx]),
+            "files": int(files_per_row[r_idx]),
+            "mentions": int(mentions_per_row[r_idx]),
+            "empty_cell_count": int(empty_per_row[r_idx]),
+            "empty_blocks": find_contiguous_empty_blocks(row_empty_flags),
+            "cell_metrics": cell_metrics_grid[r_idx]
         })
 
-        cell_metrics_grid.append(row_metrics)
-
-    empty_columns = [i for i, cnt in enumerate(per_col_empty_counts) if cnt == rows]
-    empty_rows = [r["row_index"] for r in per_row_summaries if r["empty_cell_count"] == cols]
+    # Emptiness reductions over the boolean mask: the numba kernel fuses the
+    # filled count and the per-row/per-column all-empty flags into one pass,
+    # the numpy fallback runs them as three C-level reductions
+    if NUMBA_AVAILABLE:
+        filled, row_all_empty, col_all_empty = _empty_structure_kernel(empty_mask)
+        filled_cells = int(filled)
+        empty_columns = np.flatnonzero(col_all_empty).tolist()
+        empty_rows = np.flatnonzero(row_all_empty).tolist()
+    else:
+        filled_cells = int(total_cells - empty_mask.sum())
+        empty_columns = np.flatnonzero(empty_mask.all(axis=0)).tolist()
+        empty_rows = np.flatnonzero(empty_mask.all(axis=1)).tolist()
 
     fill_percentage = round((filled_cells / total_cells) * 100, 2) if total_cells > 0 else 0.0
 
     # Determine if table is empty based on label columns skipped
-    # Table is empty if *all* data cells (columns after label columns) are empty
-    data_cells = []
-    for r in norm_table:
-        data_cells.extend(r[label_col_count:])  # skip label columns
-
-    # Check if all data cells empty (only whitespace or empty)
-    is_empty_table = all(cell_metrics(cell)["empty"] for cell in data_cells)
+    # Table is empty if *all* data cells (columns after label columns) are empty:
+    # a single C-level reduction over the mask's data-column slice
+    is_empty_table = bool(empty_mask[:, label_col_count:].all())
 
     return {
         "rows": rows,
@@ -711,6 +886,7 @@ def analyze_table_content(table: List[List[str]], label_col_count: int = 1) -> D
         "empty_columns": empty_columns,
         "per_row_summaries": per_row_summaries,
         "cell_metrics_grid": cell_metrics_grid,
+        "cell_soa": cell_soa,
         "is_empty_table": is_empty_table,
         "is_useful_table": has_any_useful_content,
         "headings": headings,
@@ -844,7 +1020,16 @@ def summarize_document(doc: Dict[str, Any]) -> Dict[str, Any]:
 
     # Calculate word counts
     total_word_count = structure.get("word_count", 0)
-    table_word_count = sum(t["words"] for t in table_summaries)
+
+    # Single pass over table summaries instead of one sum() scan per metric
+    table_word_count = 0
+    table_images_count = 0
+    table_mentions_count = 0
+    for t in table_summaries:
+        table_word_count += t["words"]
+        table_images_count += t["images"]
+        table_mentions_count += t["mentions"]
+
     word_count_excluding_tables = total_word_count - table_word_count
 
     return {
@@ -853,8 +1038,8 @@ def summarize_document(doc: Dict[str, Any]) -> Dict[str, Any]:
         "url": doc.get("url"),
         "num_tables": len(tables),
         "table_summaries": table_summaries,
-        "table_images_count": sum(t["images"] for t in table_summaries),
-        "table_mentions_count": sum(t["mentions"] for t in table_summaries),
+        "table_images_count": table_images_count,
+        "table_mentions_count": table_mentions_count,
         "table_word_count": table_word_count,
         "total_word_count": total_word_count,
         "word_count_excluding_tables": word_count_excluding_tables,
@@ -870,75 +1055,107 @@ def summarize_document(doc: Dict[str, Any]) -> Dict[str, Any]:
 #                           REPORTING
 # =============================================================================
 
+# Display separators built once instead of per print site
+_EQ_SEP = "=" * 100
+_DASH_SEP = "-" * 100
+
+# Fixed per-table metrics block, compiled once as a %-template instead of a
+# dozen f-strings re-parsed per table
+_TABLE_SUMMARY_FMT = (
+    "     • Shape              : %d rows × %d cols\n"
+    "     • Fill %%             : %s%% (%d/%d cells filled)\n"
+    "     • Empty Rows         : %d\n"
+    "     • Empty Columns      : %d\n"
+    "     • Total Empty Cells  : %d\n"
+    "     • Total Words        : %d (excl. headings)\n"
+    "     • Meaningful Words   : %d (excl. placeholders & headings)\n"
+    "     • Placeholder Words  : %d (draft, tbd, yes, no, etc.)\n"
+    "     • Links              : %d\n"
+    "     • Images             : %d\n"
+    "     • File References    : %d\n"
+    "     • User Mentions      : %d"
+)
+
+
 def print_document_summary(summary: Dict[str, Any], index: int = 0):
     """Print formatted document summary to console."""
-    print("\n" + "=" * 100)
-    print(f"📄 Document [{index}] Summary")
-    print("=" * 100)
-    print(f"🔖 Title     : {summary.get('title', 'N/A')}")
-    print(f"🆔 ID        : {summary.get('id', 'N/A')}")
-    print(f"🌐 URL       : {summary.get('url', 'N/A')}")
-    print("-" * 100)
-    print("📊 Content Overview")
-    print(f"  • Tables                        : {summary.get('num_tables', 0)}")
-    print(f"  • Table Images                  : {summary.get('table_images_count', 0)}")
-    print(f"  • Table Mentions                : {summary.get('table_mentions_count', 0)}")
-    print(f"  • Links                         : {summary.get('link_count', 0)}")
-    print(f"  • Images                        : {summary.get('image_count', 0)}")
-    print(f"  • File References               : {summary.get('file_ref_count', 0)}")
-    print(f"  • User Mentions                 : {summary.get('mention_count', 0)}")
-    print(f"  • Total Word Count              : {summary.get('total_word_count', 0)} (excl. all headings)")
-    print(f"  • Table Word Count              : {summary.get('table_word_count', 0)} (excl. table headings)")
-    print(f"  • Word Count (Excluding Tables) : {summary.get('word_count_excluding_tables', 0)} (excl. headings)")
-    print("-" * 100)
-    print("📋 Table Summaries")
-
-    if summary.get("table_summaries"):
+    # Buffer all lines and emit them with a single write instead of one
+    # print() (format + lock + write) per line
+    # Bind the bound method once instead of re-resolving summary.get per field
+    get = summary.get
+    lines = []
+    lines.append("\n" + _EQ_SEP)
+    lines.append(f"📄 Document [{index}] Summary")
+    lines.append(_EQ_SEP)
+    lines.append(f"🔖 Title     : {get('title', 'N/A')}")
+    lines.append(f"🆔 ID        : {get('id', 'N/A')}")
+    lines.append(f"🌐 URL       : {get('url', 'N/A')}")
+    lines.append(_DASH_SEP)
+    lines.append("📊 Content Overview")
+    lines.append(f"  • Tables                        : {get('num_tables', 0)}")
+    lines.append(f"  • Table Images                  : {get('table_images_count', 0)}")
+    lines.append(f"  • Table Mentions                : {get('table_mentions_count', 0)}")
+    lines.append(f"  • Links                         : {get('link_count', 0)}")
+    lines.append(f"  • Images                        : {get('image_count', 0)}")
+    lines.append(f"  • File References               : {get('file_ref_count', 0)}")
+    lines.append(f"  • User Mentions                 : {get('mention_count', 0)}")
+    lines.append(f"  • Total Word Count              : {get('total_word_count', 0)} (excl. all headings)")
+    lines.append(f"  • Table Word Count              : {get('table_word_count', 0)} (excl. table headings)")
+    lines.append(f"  • Word Count (Excluding Tables) : {get('word_count_excluding_tables', 0)} (excl. headings)")
+    lines.append(_DASH_SEP)
+    lines.append("📋 Table Summaries")
+
+    if get("table_summaries"):
         for i, t in enumerate(summary["table_summaries"], 1):
-            print(f"\n  ▶ Table {i}:")
-            print(f"     • Shape              : {t['rows']} rows × {t['cols']} cols")
-            print(f"     • Fill %             : {t['fill_percentage']}% ({t['filled_cells']}/{t['total_cells']} cells filled)")
-            print(f"     • Empty Rows         : {len(t['empty_rows'])}")
-            print(f"     • Empty Columns      : {len(t['empty_columns'])}")
-            print(f"     • Total Empty Cells  : {t['empty_cell_count']}")
-            print(f"     • Total Words        : {t['words']} (excl. headings)")
-            print(f"     • Meaningful Words   : {t.get('meaningful_words', 0)} (excl. placeholders & headings)")
-            print(f"     • Placeholder Words  : {t.get('placeholder_words', 0)} (draft, tbd, yes, no, etc.)")
-            print(f"     • Links              : {t['links']}")
-            print(f"     • Images             : {t['images']}")
-            print(f"     • File References    : {t['files']}")
-            print(f"     • User Mentions      : {t['mentions']}")
-            h = t.get("headings", {})
-            print(f"     • Heading Type       : {h.get('heading_type')}")
+            tget = t.get
+            lines.append(f"\n  ▶ Table {i}:")
+            lines.append(_TABLE_SUMMARY_FMT % (
+                t['rows'], t['cols'],
+                t['fill_percentage'], t['filled_cells'], t['total_cells'],
+                len(t['empty_rows']),
+                len(t['empty_columns']),
+                t['empty_cell_count'],
+                t['words'],
+                tget('meaningful_words', 0),
+                tget('placeholder_words', 0),
+                t['links'],
+                t['images'],
+                t['files'],
+                t['mentions'],
+            ))
+            h = tget("headings", {})
+            lines.append(f"     • Heading Type       : {h.get('heading_type')}")
 
             if h.get("column_headers"):
-                print(f"     • Column Headers     : {h['column_headers']}")
+                lines.append(f"     • Column Headers     : {h['column_headers']}")
 
             if h.get("row_headers"):
-                print(f"     • Row Headers        : {h['row_headers']}")
+                lines.append(f"     • Row Headers        : {h['row_headers']}")
 
             # Detect gibberish or sparse tables based on meaningful words
-            is_useful = t.get("is_useful_table", False)
-            meaningful = t.get('meaningful_words', 0)
-            
-            if t.get("is_empty_table", False):
-                print(f"     • Notes              : ❌ Empty table")
+            is_useful = tget("is_useful_table", False)
+            meaningful = tget('meaningful_words', 0)
+
+            if tget("is_empty_table", False):
+                lines.append(f"     • Notes              : ❌ Empty table")
             elif not is_useful or meaningful < 2:
-                print(f"     • Notes              : ⚠️  Gibberish or placeholder table (no meaningful content)")
+                lines.append(f"     • Notes              : ⚠️  Gibberish or placeholder table (no meaningful content)")
             elif t["fill_percentage"] < 30 and meaningful < 10:
-                print(f"     • Notes              : ⚠️  Sparse table with limited content")
+                lines.append(f"     • Notes              : ⚠️  Sparse table with limited content")
             else:
-                print(f"     • Notes              : ✅ Useful table with meaningful content")
+                lines.append(f"     • Notes              : ✅ Useful table with meaningful content")
 
     else:
-        print("  ❌ No tables found.")
-    
-    print("-" * 100)
-    print("🧱 Structure Summary")
-    structure = summary.get("structure_summary", {})
+        lines.append("  ❌ No tables found.")
+
+    lines.append(_DASH_SEP)
+    lines.append("🧱 Structure Summary")
+    structure = get("structure_summary", {})
     for k, v in structure.items():
-        print(f"  • {k:<20}: {v}")
-    print("=" * 100 + "\n")
+        lines.append(f"  • {k:<20}: {v}")
+    lines.append(_EQ_SEP + "\n")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # =============================================================================
@@ -965,12 +1182,13 @@ if __name__ == "__main__":
     dump_file_name = DEFAULT_DATA_FILE
 
     try:
+        # Seek to the target line with islice instead of parsing the whole file
         with open(dump_file_name, "r", encoding="utf-8") as f:
-            items = [json.loads(line) for line in f if line.strip()]
-            if items:
-                process_json_obj(items[DEFAULT_TEST_INDEX], idx=DEFAULT_TEST_INDEX)
-            else:
-                print("❌ No items found in the JSONL file")
+            line = next(islice(f, DEFAULT_TEST_INDEX, DEFAULT_TEST_INDEX + 1), None)
+        if line is not None and line.strip():
+            process_json_obj(json.loads(line), idx=DEFAULT_TEST_INDEX)
+        else:
+            print("❌ No items found in the JSONL file")
     except FileNotFoundError:
         print(f"❌ File not found: {dump_file_name}")
     except Exception as e:
@@ -12,6 +12,7 @@ Returns raw JSON dictionary with all parameters collected.
 import json
 import sys
 import os
+from itertools import islice
 from typing import Dict, Any
 
 # Add current directory to path to import check_markdown
@@ -73,6 +74,11 @@ def collect_document_data(doc: Dict[str, Any]) -> Dict[str, Any]:
             "analysis": table_analysis
         })
     
+    # Usefulness flags computed once; the table-count metrics below reuse the
+    # boolean list instead of re-reading each analysis per metric
+    useful_flags = [t["analysis"]["is_useful_table"] for t in table_summaries]
+    useful_table_count = sum(1 for flag in useful_flags if flag)
+
     # Scan text for links, images, files, mentions
     text_scan = find_links_images(markdown_content)
     
@@ -82,9 +88,37 @@ def collect_document_data(doc: Dict[str, Any]) -> Dict[str, Any]:
     # Calculate word counts safely
     # NOTE: total_word_count from analyze_markdown_structure already excludes tables, headings, and metadata
     total_word_count = structure.get("word_count", 0)
-    table_word_count = sum(t["analysis"].get("words", 0) for t in table_summaries) if table_summaries else 0
-    table_meaningful_words = sum(t["analysis"].get("meaningful_words", 0) for t in table_summaries) if table_summaries else 0
-    table_placeholder_words = sum(t["analysis"].get("placeholder_words", 0) for t in table_summaries) if table_summaries else 0
+
+    # Fused single pass over table analyses: each aggregate below used to be
+    # its own sum(...)/any(...) comprehension re-walking table_summaries
+    table_word_count = 0
+    table_meaningful_words = 0
+    table_placeholder_words = 0
+    table_images_count = 0
+    table_mentions_count = 0
+    table_links_count = 0
+    table_files_count = 0
+    total_table_cells = 0
+    total_filled_cells = 0
+    fill_percentage_sum = 0.0
+    has_empty_tables = False
+    # Direct indexing: analyze_table_content always emits these keys, so the
+    # .get default branches were dead weight
+    for t in table_summaries:
+        analysis = t["analysis"]
+        table_word_count += analysis["words"]
+        table_meaningful_words += analysis["meaningful_words"]
+        table_placeholder_words += analysis["placeholder_words"]
+        table_images_count += analysis["images"]
+        table_mentions_count += analysis["mentions"]
+        table_links_count += analysis["links"]
+        table_files_count += analysis["files"]
+        total_table_cells += analysis["total_cells"]
+        total_filled_cells += analysis["filled_cells"]
+        fill_percentage_sum += analysis["fill_percentage"]
+        if analysis["is_empty_table"]:
+            has_empty_tables = True
+
     # Since total_word_count already excludes tables, no need to subtract again
     word_count_excluding_tables = total_word_count
     
@@ -104,10 +138,10 @@ def collect_document_data(doc: Dict[str, Any]) -> Dict[str, Any]:
         "tables": table_summaries,
         
         # Table aggregated metrics
-        "table_images_count": sum(t["analysis"].get("images", 0) for t in table_summaries) if table_summaries else 0,
-        "table_mentions_count": sum(t["analysis"].get("mentions", 0) for t in table_summaries) if table_summaries else 0,
-        "table_links_count": sum(t["analysis"].get("links", 0) for t in table_summaries) if table_summaries else 0,
-        "table_files_count": sum(t["analysis"].get("files", 0) for t in table_summaries) if table_summaries else 0,
+        "table_images_count": table_images_count,
+        "table_mentions_count": table_mentions_count,
+        "table_links_count": table_links_count,
+        "table_files_count": table_files_count,
         "table_word_count": table_word_count,
         "table_meaningful_words": table_meaningful_words,
         "table_placeholder_words": table_placeholder_words,
@@ -127,14 +161,14 @@ def collect_document_data(doc: Dict[str, Any]) -> Dict[str, Any]:
         
         # Additional metadata
         "has_tables": len(tables) > 0,
-        "has_empty_tables": any(t["analysis"].get("is_empty_table", True) for t in table_summaries) if table_summaries else False,
-        "has_useful_tables": any(t["analysis"].get("is_useful_table", False) for t in table_summaries) if table_summaries else False,
-        "useful_table_count": sum(1 for t in table_summaries if t["analysis"].get("is_useful_table", False)) if table_summaries else 0,
-        "gibberish_table_count": sum(1 for t in table_summaries if not t["analysis"].get("is_useful_table", False)) if table_summaries else 0,
-        "total_table_cells": sum(t["analysis"].get("total_cells", 0) for t in table_summaries) if table_summaries else 0,
-        "total_filled_cells": sum(t["analysis"].get("filled_cells", 0) for t in table_summaries) if table_summaries else 0,
+        "has_empty_tables": has_empty_tables,
+        "has_useful_tables": useful_table_count > 0,
+        "useful_table_count": useful_table_count,
+        "gibberish_table_count": len(table_summaries) - useful_table_count,
+        "total_table_cells": total_table_cells,
+        "total_filled_cells": total_filled_cells,
         "average_table_fill_percentage": (
-            round(sum(t["analysis"].get("fill_percentage", 0.0) for t in table_summaries) / len(table_summaries), 2)
+            round(fill_percentage_sum / len(table_summaries), 2)
             if table_summaries else 0.0
         ),
     }
@@ -148,13 +182,14 @@ def collect_document_data(doc: Dict[str, Any]) -> Dict[str, Any]:
 if __name__ == "__main__":
     dump_file_name = DEFAULT_DATA_FILE
     try:
+        # Seek to the target line with islice instead of parsing the whole file
         with open(dump_file_name, "r", encoding="utf-8") as f:
-            items = [json.loads(line) for line in f if line.strip()]
-            if items:
-                result = collect_document_data(items[DEFAULT_TEST_INDEX])
-                print(result)
-            else:
-                print("❌ No items found in the JSONL file")
+            line = next(islice(f, DEFAULT_TEST_INDEX, DEFAULT_TEST_INDEX + 1), None)
+        if line is not None and line.strip():
+            result = collect_document_data(json.loads(line))
+            print(result)
+        else:
+            print("❌ No items found in the JSONL file")
     except FileNotFoundError:
         print(f"❌ File not found: {dump_file_name}")
     except Exception as e:
@@ -23,6 +23,7 @@ import re
 import html
 import json
 import sys
+from itertools import islice
 from typing import Tuple, Dict, Any, List, Optional
 
 # =============================================================================
@@ -36,6 +37,17 @@ _UI_MACROS = {"info", "note", "tip", "warning", "success", "error"}
 DEFAULT_CONFLUENCE_DATA_PATH = "/Users/rishabh.singh/Desktop/markdown_filter/filter/data/confluence_markdown.jsonl"
 DEFAULT_TEST_INDEX = 6687
 
+# Emoticon shortname -> emoji character (built once, not per node)
+_EMOJI_MAP = {
+    'clipboard': '📋',
+    'thought_balloon': '💭',
+    'white_check_mark': '✅',
+    'blue_star': '⭐',
+    'warning': '⚠️',
+    'information_source': 'ℹ️',
+    'check_mark_button': '✅',
+}
+
 
 # =============================================================================
 #                           UTILITY FUNCTIONS
@@ -196,16 +208,7 @@ def _node_to_markdown(node, list_level: int = 0) -> str:
     if name == 'ac:emoticon':
         emoji_key = node.get('ac:emoji-shortname') or node.get('ac:name') or ''
         emoji_key = emoji_key.strip(':').replace('-', '_')
-        emoji_map = {
-            'clipboard': '📋',
-            'thought_balloon': '💭',
-            'white_check_mark': '✅',
-            'blue_star': '⭐',
-            'warning': '⚠️',
-            'information_source': 'ℹ️',
-            'check_mark_button': '✅',
-        }
-        return emoji_map.get(emoji_key, f":{emoji_key}:")
+        return _EMOJI_MAP.get(emoji_key, f":{emoji_key}:")
 
     # Handle Confluence link to users <ac:link> that wraps <ri:user>
     if name == 'ac:link':
@@ -621,10 +624,15 @@ def convert_html_to_markdown(html_str: str) -> str:
 if __name__ == "__main__":
     dump_file = DEFAULT_CONFLUENCE_DATA_PATH
 
+    # Seek to the target line with islice instead of parsing the whole file
     with open(dump_file, "r", encoding="utf-8") as f:
-        items = [json.loads(line) for line in f if line.strip()]
+        line = next(islice(f, DEFAULT_TEST_INDEX, DEFAULT_TEST_INDEX + 1), None)
+
+    if line is None:
+        print(f"❌ No record at index {DEFAULT_TEST_INDEX} in {dump_file}")
+        sys.exit(1)
 
-    record = items[DEFAULT_TEST_INDEX]
+    record = json.loads(line)
     html_body = record.get("body", "")
     md = convert_html_to_markdown(html_body)
     
@@ -8,10 +8,15 @@ Tests page and table gibberish detection on a specific document by page ID and U
 #                           IMPORTS
 # =============================================================================
 
-import json
-import sys 
+import sys
 
 from page_decider import is_page_gibberish
+
+# Prefer orjson's C parser for record decoding when available
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 from table_decider import is_table_gibberish
 from collect import collect_document_data
 
@@ -33,10 +38,16 @@ def main():
     url = DEFAULT_URL
 
 
+    page_id_str = str(page_id)
+
     with open(dump_file_name, "r", encoding="utf-8") as f:
         for line_number, line in enumerate(f):
-            data = json.loads(line)
-            if str(data.get("id")) != str(page_id) or data.get("url") != url:
+            # Cheap substring pre-filter: only lines that can possibly match
+            # get the full JSON parse
+            if page_id_str not in line:
+                continue
+            data = _json.loads(line)
+            if str(data.get("id")) != page_id_str or data.get("url") != url:
                 continue
 
             # Extract parameters from data fields
@@ -56,5 +67,7 @@ def main():
             print(f"Decision: {page_info['reason']}")
             # print(f"Table {page_id} is gibberish: {table_is_gibberish}")
 
+            break  # target document processed; don't scan the rest of the file
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -11,14 +11,22 @@ Uses async processing with progress tracking via tqdm.
 
 import json
 import asyncio
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Any, List
 from tqdm.asyncio import tqdm_asyncio
 from tqdm import tqdm
 
-from page_decider import is_page_gibberish
+from page_decider import is_page_gibberish_fast
 from collect import collect_document_data
 
+# Prefer orjson's C parser for record decoding when available (stdlib json
+# stays in use for writing, which needs ensure_ascii=False text output)
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 # =============================================================================
 #                           CONFIGURATION PARAMETERS
 # =============================================================================
@@ -42,12 +50,19 @@ async def process_document(doc: Dict[str, Any]) -> Dict[str, Any]:
         Original document dict with added 'result' field containing decision info
     """
     try:
-        # Collect document data for analysis
-        doc_data = collect_document_data(doc)
-        
-        # Determine if page is gibberish
-        page_is_gibberish = is_page_gibberish(doc_data)[0]
-        
+        # Easy bucket: a document with no body converts to empty markdown and
+        # can never be useful, so skip the conversion/analysis pipeline and
+        # the decider entirely
+        body = doc.get("body", "")
+        if not body or not body.strip():
+            page_is_gibberish = True
+        else:
+            # Hard bucket: collect document data for analysis
+            doc_data = collect_document_data(doc)
+
+            # Determine if page is gibberish (fast path: verdict only, no breakdown)
+            page_is_gibberish = is_page_gibberish_fast(doc_data)
+
         # Create result dictionary
         result = {
             "is_gibberish": "yes" if page_is_gibberish else "no",
@@ -122,7 +137,7 @@ def read_jsonl(file_path: str) -> List[Dict[str, Any]]:
     with open(file_path, 'r', encoding='utf-8') as f:
         for line in tqdm(f, desc="Reading input file"):
             if line.strip():
-                documents.append(json.loads(line))
+                documents.append(_json.loads(line))
     return documents
 
 
@@ -165,19 +180,15 @@ async def main_async(input_file: str, output_file: str, batch_size: int = 10):
     processed_documents = await process_documents_batch(documents, batch_size)
     print(f"Processed {len(processed_documents)} documents\n")
     
-    # Count results
-    gibberish_count = sum(
-        1 for doc in processed_documents 
-        if doc.get("result", {}).get("is_gibberish") == "yes"
-    )
-    useful_count = sum(
-        1 for doc in processed_documents 
-        if doc.get("result", {}).get("is_gibberish") == "no"
-    )
-    error_count = sum(
-        1 for doc in processed_documents 
-        if doc.get("result", {}).get("status") == "ERROR"
+    # Count results in a single pass instead of three full scans; error
+    # results always carry is_gibberish None (see process_document), so the
+    # None bucket is the error count
+    counts = Counter(
+        doc.get("result", {}).get("is_gibberish") for doc in processed_documents
     )
+    gibberish_count = counts["yes"]
+    useful_count = counts["no"]
+    error_count = counts[None]
     
     print(f"Results:")
     print(f"  ✅ Useful pages: {useful_count}")
@@ -13,8 +13,11 @@ Predictions: 'result.is_gibberish' field ("yes" or "no")
 # =============================================================================
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 import numpy as np
 from sklearn.metrics import (
@@ -26,6 +29,31 @@ from sklearn.metrics import (
     classification_report
 )
 
+# =============================================================================
+#                           PYARROW MODULE IMPORT
+# =============================================================================
+
+# Optional: pyarrow parses NDJSON in parallel C++ blocks, which is much faster
+# than a Python line-by-line loop on large annotation files.
+PYARROW_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pa_json = None
+    pc = None
+
+# Prefer orjson's C parser for record decoding when available (stdlib json
+# stays in use for writing, which needs ensure_ascii=False text output)
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
 # =============================================================================
 #                           CONFIGURATION PARAMETERS
 # =============================================================================
@@ -33,32 +61,50 @@ from sklearn.metrics import (
 DEFAULT_INPUT_FILE = "/Users/rishabh.singh/Desktop/markdown_filter/filter/results/label_studio_gibberish_results_3.jsonl"
 DEFAULT_MISPREDICTIONS_FILE = "/Users/rishabh.singh/Desktop/markdown_filter/filter/results/mispredictions.json"
 
+# Valid annotation/prediction labels, hashed for O(1) membership checks
+VALID_LABELS = frozenset({'yes', 'no'})
+
+# Input files smaller than this are scanned serially; the process-pool
+# startup cost only pays off on large files
+PARALLEL_SCAN_MIN_BYTES = 64 * 1024 * 1024
+
+# Descriptive labels for the compact error tags used during scanning
+ERROR_TYPE_LABELS = {
+    'FP': "False Positive (Useful marked as Gibberish)",
+    'FN': "False Negative (Gibberish marked as Useful)",
+}
+
 # =============================================================================
 #                           DATA LOADING FUNCTIONS
 # =============================================================================
 
-def load_data(file_path: str) -> Tuple[List[str], List[str]]:
+def load_data(file_path: str) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
     """
     Load ground truth and predictions from JSONL file.
-    
+
+    Also collects the misprediction records during the same parse, so main()
+    doesn't have to read and decode the file a second time for
+    save_mispredictions().
+
     Args:
         file_path: Path to JSONL file with annotations and results
-    
+
     Returns:
-        Tuple of (ground_truth, predictions) lists
+        Tuple of (ground_truth, predictions, mispredictions) lists
     """
     ground_truth = []
     predictions = []
+    mispredictions = []
     skipped = 0
-    
+
     with open(file_path, 'r', encoding='utf-8') as f:
         for line_num, line in enumerate(f, 1):
             if not line.strip():
                 continue
                 
             try:
-                data = json.loads(line)
-                
+                data = _json.loads(line)
+
                 # Get ground truth annotation
                 annotation = data.get('annotation', '').strip()
                 
@@ -76,20 +122,26 @@ def load_data(file_path: str) -> Tuple[List[str], List[str]]:
                     continue
                 
                 # Validate values
-                if annotation not in ['yes', 'no']:
+                if annotation not in VALID_LABELS:
                     print(f"Warning: Line {line_num} has invalid annotation: {annotation}")
                     skipped += 1
                     continue
                     
-                if prediction not in ['yes', 'no']:
+                if prediction not in VALID_LABELS:
                     print(f"Warning: Line {line_num} has invalid prediction: {prediction}")
                     skipped += 1
                     continue
                 
                 ground_truth.append(annotation)
                 predictions.append(prediction)
-                
-            except json.JSONDecodeError as e:
+
+                if annotation != prediction:
+                    misprediction = _misprediction_from_record(data)
+                    if misprediction is not None:
+                        mispredictions.append(misprediction)
+
+            except ValueError as e:
+                # Covers both json.JSONDecodeError and orjson.JSONDecodeError
                 print(f"Warning: Line {line_num} is not valid JSON: {e}")
                 skipped += 1
                 continue
@@ -99,7 +151,7 @@ def load_data(file_path: str) -> Tuple[List[str], List[str]]:
         print(f"Skipped {skipped} samples (missing/invalid annotations or predictions)")
     print()
     
-    return ground_truth, predictions
+    return ground_truth, predictions, mispredictions
 
 # =============================================================================
 #                           METRICS CALCULATION
@@ -116,10 +168,14 @@ def calculate_metrics(y_true: List[str], y_pred: List[str]) -> Dict[str, Any]:
     Returns:
         Dictionary containing all metrics
     """
-    # Convert to binary (1 = gibberish/yes, 0 = useful/no)
-    y_true_binary = [1 if label == 'yes' else 0 for label in y_true]
-    y_pred_binary = [1 if label == 'yes' else 0 for label in y_pred]
-    
+    # Convert to binary numpy arrays once (1 = gibberish/yes, 0 = useful/no);
+    # every sklearn call below would otherwise re-coerce the Python lists
+    y_true_binary = (np.asarray(y_true) == 'yes').astype(np.int8)
+    y_pred_binary = (np.asarray(y_pred) == 'yes').astype(np.int8)
+    gibberish_true = int(y_true_binary.sum())
+    gibberish_pred = int(y_pred_binary.sum())
+
+
     # Calculate metrics
     metrics = {
         'accuracy': accuracy_score(y_true_binary, y_pred_binary),
@@ -149,10 +205,10 @@ def calculate_metrics(y_true: List[str], y_pred: List[str]) -> Dict[str, Any]:
         
         # Class distribution
         'total_samples': len(y_true),
-        'gibberish_true': sum(y_true_binary),
-        'useful_true': len(y_true_binary) - sum(y_true_binary),
-        'gibberish_pred': sum(y_pred_binary),
-        'useful_pred': len(y_pred_binary) - sum(y_pred_binary),
+        'gibberish_true': gibberish_true,
+        'useful_true': len(y_true) - gibberish_true,
+        'gibberish_pred': gibberish_pred,
+        'useful_pred': len(y_pred) - gibberish_pred,
     }
     
     return metrics
@@ -254,57 +310,257 @@ def print_sklearn_classification_report(y_true: List[str], y_pred: List[str]):
 #                           MISPREDICTION STORAGE
 # =============================================================================
 
-def save_mispredictions(file_path: str, output_file: str):
+def _misprediction_from_record(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
-    Extract and save mispredicted results to JSON file.
-    
+    Build a misprediction record from a parsed JSONL entry.
+
+    Args:
+        data: Parsed document dictionary
+
+    Returns:
+        Misprediction dictionary (with compact 'FP'/'FN' error tag), or
+        None if the entry is invalid or correctly predicted
+    """
+    annotation = data.get('annotation', '').strip()
+    prediction = data.get('result', {}).get('is_gibberish', '').strip()
+
+    # Skip if missing or invalid
+    if not annotation or not prediction:
+        return None
+    if annotation not in VALID_LABELS or prediction not in VALID_LABELS:
+        return None
+    if annotation == prediction:
+        return None
+
+    return {
+        'url': data.get('url', 'N/A'),
+        'title': data.get('title', 'N/A'),
+        'ground_truth': annotation,
+        'prediction': prediction,
+        'error_type': 'FP' if annotation == 'no' else 'FN'
+    }
+
+
+def _iter_mispredictions_loop(file_path: str):
+    """
+    Yield mispredicted records from a line-by-line Python loop.
+
+    Generator so records can be written out as they are discovered instead
+    of being accumulated in memory first.
+
     Args:
         file_path: Path to input JSONL file with annotations and results
-        output_file: Path to output JSON file for mispredictions
+
+    Yields:
+        Misprediction dictionaries
     """
-    mispredictions = []
-    
     with open(file_path, 'r', encoding='utf-8') as f:
-        for line_num, line in enumerate(f, 1):
+        for line in f:
             if not line.strip():
                 continue
-            
+
             try:
-                data = json.loads(line)
-                
-                # Get ground truth and prediction
-                annotation = data.get('annotation', '').strip()
-                prediction = data.get('result', {}).get('is_gibberish', '').strip()
-                
-                # Skip if missing or invalid
-                if not annotation or not prediction:
-                    continue
-                if annotation not in ['yes', 'no'] or prediction not in ['yes', 'no']:
-                    continue
-                
-                # Check if mispredicted
-                if annotation != prediction:
-                    misprediction = {
-                        'url': data.get('url', 'N/A'),
-                        'title': data.get('title', 'N/A'),
-                        'ground_truth': annotation,
-                        'prediction': prediction,
-                        'error_type': get_error_type(annotation, prediction)
-                    }
-                    mispredictions.append(misprediction)
-                    
-            except json.JSONDecodeError:
+                data = _json.loads(line)
+            except ValueError:
                 continue
-    
-    # Save to JSON file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(mispredictions, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n💾 Saved {len(mispredictions)} mispredictions to: {output_file}")
-    
+
+            misprediction = _misprediction_from_record(data)
+            if misprediction is not None:
+                yield misprediction
+
+
+def _scan_byte_range(file_path: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """
+    Scan one newline-aligned byte range of the input file for mispredictions.
+
+    Worker function for the parallel scan; each process opens the file
+    independently and parses only its own slice.
+
+    Args:
+        file_path: Path to input JSONL file
+        start: Byte offset of the first line in the range
+        end: Byte offset just past the last line in the range
+
+    Returns:
+        List of misprediction dictionaries found in the range
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+
+    mispredictions = []
+    for raw_line in chunk.splitlines():
+        if not raw_line.strip():
+            continue
+        try:
+            data = _json.loads(raw_line)
+        except ValueError:
+            continue
+        misprediction = _misprediction_from_record(data)
+        if misprediction is not None:
+            mispredictions.append(misprediction)
+    return mispredictions
+
+
+def _iter_mispredictions_parallel(file_path: str, file_size: int):
+    """
+    Yield mispredicted records by scanning the file in parallel processes.
+
+    Splits the file into one newline-aligned byte range per CPU and maps
+    _scan_byte_range over a process pool; each line is parsed exactly once,
+    in exactly one worker.
+
+    Args:
+        file_path: Path to input JSONL file
+        file_size: Size of the file in bytes
+
+    Yields:
+        Misprediction dictionaries (in file order)
+    """
+    workers = os.cpu_count() or 1
+    step = max(1, file_size // workers)
+
+    # Compute newline-aligned range boundaries
+    ranges = []
+    start = 0
+    with open(file_path, 'rb') as f:
+        for i in range(1, workers):
+            target = min(i * step, file_size)
+            if target <= start:
+                continue
+            f.seek(target)
+            f.readline()  # advance to the next line boundary
+            boundary = f.tell()
+            if boundary > start:
+                ranges.append((start, boundary))
+                start = boundary
+    if start < file_size:
+        ranges.append((start, file_size))
+
+    starts = [r[0] for r in ranges]
+    ends = [r[1] for r in ranges]
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        for batch in executor.map(_scan_byte_range, repeat(file_path), starts, ends):
+            yield from batch
+
+
+def _collect_mispredictions_arrow(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Collect mispredicted records using pyarrow's parallel NDJSON reader.
+
+    Parses the whole file into Arrow columns (multi-threaded, block-based),
+    then builds the misprediction mask with Arrow compute kernels instead of
+    per-line Python code.
+
+    Args:
+        file_path: Path to input JSONL file with annotations and results
+
+    Returns:
+        List of misprediction dictionaries
+    """
+    table = pa_json.read_json(
+        file_path,
+        read_options=pa_json.ReadOptions(block_size=8 * 1024 * 1024, use_threads=True),
+    )
+
+    # Flatten the nested result.is_gibberish field into a plain column
+    annotation = pc.utf8_trim_whitespace(
+        pc.cast(table.column('annotation'), pa.string())
+    )
+    prediction = pc.utf8_trim_whitespace(
+        pc.cast(pc.struct_field(table.column('result'), 'is_gibberish'), pa.string())
+    )
+
+    # Valid rows have a yes/no annotation and prediction; mispredictions differ
+    valid_labels = pa.array(list(VALID_LABELS))
+    mask = pc.and_(
+        pc.and_(
+            pc.is_in(annotation, value_set=valid_labels),
+            pc.is_in(prediction, value_set=valid_labels),
+        ),
+        pc.not_equal(annotation, prediction),
+    )
+
+    table = table.append_column('_annotation', annotation)
+    table = table.append_column('_prediction', prediction)
+    filtered = table.filter(pc.fill_null(mask, False))
+
+    mispredictions = []
+    has_url = 'url' in filtered.column_names
+    has_title = 'title' in filtered.column_names
+    for row in filtered.to_pylist():
+        annotation = row['_annotation']
+        prediction = row['_prediction']
+        mispredictions.append({
+            'url': (row.get('url') if has_url else None) or 'N/A',
+            'title': (row.get('title') if has_title else None) or 'N/A',
+            'ground_truth': annotation,
+            'prediction': prediction,
+            'error_type': 'FP' if annotation == 'no' else 'FN'
+        })
+
     return mispredictions
 
 
+def save_mispredictions(file_path: str, output_file: str,
+                        records: Optional[List[Dict[str, Any]]] = None):
+    """
+    Extract and save mispredicted results to JSON file.
+
+    When the caller already has the misprediction records (e.g. collected by
+    load_data() during its parse), pass them via `records` to skip re-reading
+    the input file entirely.
+
+    Otherwise, uses pyarrow's parallel NDJSON reader when available. Without pyarrow,
+    large files are split into newline-aligned byte ranges scanned by a
+    process pool (one worker per CPU); small files use the plain
+    line-by-line loop. Records are streamed to the output
+    file as they are found instead of being accumulated in a list first, so
+    memory use stays constant regardless of how many mispredictions exist.
+
+    Args:
+        file_path: Path to input JSONL file with annotations and results
+        output_file: Path to output JSON file for mispredictions
+        records: Pre-collected misprediction records (with compact
+            'FP'/'FN' error tags); when given, file_path is not read
+
+    Returns:
+        Number of mispredictions written
+    """
+    if records is None and PYARROW_AVAILABLE:
+        try:
+            records = _collect_mispredictions_arrow(file_path)
+        except (pa.lib.ArrowInvalid, KeyError):
+            # Arrow parses the whole file at once and can't skip malformed
+            # lines or missing fields the way the line loop does; fall back
+            # to the tolerant scan paths below instead of crashing
+            records = None
+    if records is None:
+        file_size = os.path.getsize(file_path)
+        if file_size >= PARALLEL_SCAN_MIN_BYTES and (os.cpu_count() or 1) > 1:
+            records = _iter_mispredictions_parallel(file_path, file_size)
+        else:
+            records = _iter_mispredictions_loop(file_path)
+
+    # Stream records into a JSON array incrementally
+    count = 0
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write('[')
+        for record in records:
+            # Expand the compact error tag to the descriptive label on write
+            record['error_type'] = ERROR_TYPE_LABELS.get(
+                record['error_type'], record['error_type']
+            )
+            f.write(',\n  ' if count else '\n  ')
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write('\n]' if count else ']')
+
+    print(f"\n💾 Saved {count} mispredictions to: {output_file}")
+
+    return count
+
+
 def get_error_type(ground_truth: str, prediction: str) -> str:
     """
     Determine the type of prediction error.
@@ -317,9 +573,9 @@ def get_error_type(ground_truth: str, prediction: str) -> str:
         Error type description
     """
     if ground_truth == 'no' and prediction == 'yes':
-        return "False Positive (Useful marked as Gibberish)"
+        return ERROR_TYPE_LABELS['FP']
     elif ground_truth == 'yes' and prediction == 'no':
-        return "False Negative (Gibberish marked as Useful)"
+        return ERROR_TYPE_LABELS['FN']
     else:
         return "Correct"
 
@@ -336,8 +592,8 @@ def main():
     
     print(f"Loading data from: {input_file}\n")
     
-    # Load data
-    y_true, y_pred = load_data(input_file)
+    # Load data (mispredictions come along for free from the same parse)
+    y_true, y_pred, mispredictions = load_data(input_file)
     
     if len(y_true) == 0:
         print("❌ Error: No valid samples found with both annotations and predictions")
@@ -352,8 +608,8 @@ def main():
     # Print sklearn classification report
     print_sklearn_classification_report(y_true, y_pred)
     
-    # Save mispredictions
-    mispredictions = save_mispredictions(input_file, mispredictions_file)
+    # Save mispredictions without a second pass over the input file
+    save_mispredictions(input_file, mispredictions_file, records=mispredictions)
 
 
 if __name__ == "__main__":
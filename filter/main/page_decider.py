@@ -9,10 +9,18 @@ Uses table analysis from table_decider.py and content metrics from collect.py.
 #                           IMPORTS
 # =============================================================================
 
-import json
+import operator
 import sys
-from collect import collect_document_data
-from table_decider import is_table_gibberish
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, List
+
+# Prefer orjson's C parser for record decoding when available
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+from table_decider import decide_tables, print_table_details, LazyReason, _SEPARATOR
 
 # =============================================================================
 #                           CONFIGURATION PARAMETERS
@@ -23,10 +31,108 @@ DEFAULT_TEST_INDEX = 100
 DEFAULT_TEST_PAGE_ID = 2198077443
 WORDS_OUTSIDE_TABLES_THRESHOLD = 20
 
+# Verdict-to-label lookup instead of a conditional expression per page
+_PAGE_STATUS = {True: "❌ GIBBERISH PAGE", False: "✅ USEFUL PAGE"}
+
+# Batch extraction of the metrics read by is_page_gibberish: one itemgetter
+# call instead of ten .get() dispatches per page
+_PAGE_METRIC_KEYS = ('useful_table_count', 'word_count_excluding_tables',
+                     'link_count', 'image_count', 'file_ref_count',
+                     'mention_count', 'table_links_count',
+                     'table_images_count', 'table_files_count',
+                     'table_mentions_count')
+_GET_PAGE_METRICS = operator.itemgetter(*_PAGE_METRIC_KEYS)
+
 # =============================================================================
 #                           CORE FUNCTIONS
 # =============================================================================
 
+@dataclass(slots=True)
+class PageDecisionInfo:
+    """
+    Decision breakdown for one page.
+
+    Slotted dataclass instead of a free-form dict, matching
+    TableDecisionInfo in table_decider.py. Supports ['key'] subscripting
+    for existing dict-style consumers.
+    """
+    is_gibberish: bool
+    useful_table_count: int
+    gibberish_table_count: int
+    total_tables: int
+    words_outside_tables: int
+    links_outside_tables: int
+    images_outside_tables: int
+    files_outside_tables: int
+    mentions_outside_tables: int
+    useful_indicators: List[tuple]
+    reason: Any
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
+def _compile_page_scorer(words_outside_tables_threshold):
+    """
+    Generate a specialized page-scoring function with thresholds inlined.
+
+    Emits the early-exit indicator checks as source code with the numeric
+    threshold baked in as a constant (partial evaluation), so the compiled
+    function does no global/constant lookups per call. Compiled once at
+    import time and reused for every document.
+
+    Args:
+        words_outside_tables_threshold: Words-outside-tables cutoff to inline
+
+    Returns:
+        Callable taking doc_data and returning True if gibberish
+    """
+    source = (
+        "def _score(doc_data):\n"
+        "    get = doc_data.get\n"
+        "    if get('useful_table_count', 0) > 0:\n"
+        "        return False\n"
+        f"    if get('word_count_excluding_tables', 0) >= {words_outside_tables_threshold:d}:\n"
+        "        return False\n"
+        "    if get('link_count', 0) > get('table_links_count', 0):\n"
+        "        return False\n"
+        "    if get('image_count', 0) > get('table_images_count', 0):\n"
+        "        return False\n"
+        "    if get('file_ref_count', 0) > get('table_files_count', 0):\n"
+        "        return False\n"
+        "    if get('mention_count', 0) > get('table_mentions_count', 0):\n"
+        "        return False\n"
+        "    return True\n"
+    )
+    namespace = {}
+    exec(compile(source, "<page_scorer>", "exec"), namespace)
+    return namespace["_score"]
+
+
+# Specialized scorer compiled once for the configured threshold
+_score_page = _compile_page_scorer(WORDS_OUTSIDE_TABLES_THRESHOLD)
+
+
+def is_page_gibberish_fast(doc_data) -> bool:
+    """
+    Fast boolean-only version of is_page_gibberish().
+
+    Checks the same useful-content criteria but returns as soon as the first
+    one passes, skipping the remaining checks and all decision-breakdown
+    string formatting. Intended for batch callers that only need the verdict;
+    use is_page_gibberish() when the full decision breakdown is required.
+
+    Args:
+        doc_data: Document data dictionary from collect_document_data()
+
+    Returns:
+        bool: True if gibberish, False if useful
+    """
+    if not doc_data:
+        return True
+    return _score_page(doc_data)
+
+
 def is_page_gibberish(doc_data):
     """
     Determine if a page is gibberish based on meaningful content (excluding headings).
@@ -45,81 +151,103 @@ def is_page_gibberish(doc_data):
     
     Returns:
         bool: True if gibberish, False if useful
-        dict: Decision breakdown with reasons
+        PageDecisionInfo: Decision breakdown with reasons
     """
     if not doc_data:
-        return True, {"reason": "Empty or invalid document data"}
-    
+        return True, PageDecisionInfo(
+            is_gibberish=True,
+            useful_table_count=0, gibberish_table_count=0, total_tables=0,
+            words_outside_tables=0, links_outside_tables=0,
+            images_outside_tables=0, files_outside_tables=0,
+            mentions_outside_tables=0,
+            useful_indicators=[],
+            reason="Empty or invalid document data",
+        )
+
+    # Bind the bound method once instead of re-resolving doc_data.get per read
+    get = doc_data.get
+
+    # Memoized: the decision is a pure function of the collected data, so
+    # callers that decide the same page more than once reuse the cached
+    # result, mirroring the table-level '_decision' cache
+    cached = get('_decision')
+    if cached is not None:
+        return cached
+
+    # Extract metrics (word counts already exclude headings, and
+    # word_count_excluding_tables excludes both headings and tables)
+    try:
+        (useful_table_count, words_outside_tables,
+         total_links, total_images, total_files, total_mentions,
+         table_links, table_images, table_files,
+         table_mentions) = _GET_PAGE_METRICS(doc_data)
+    except KeyError:
+        # Partial doc_data dict (shouldn't happen for collect_document_data output)
+        (useful_table_count, words_outside_tables,
+         total_links, total_images, total_files, total_mentions,
+         table_links, table_images, table_files,
+         table_mentions) = (get(k, 0) for k in _PAGE_METRIC_KEYS)
+
     # Check for useful tables
-    useful_table_count = doc_data.get('useful_table_count', 0)
     has_useful_tables = useful_table_count > 0
+
+
+    # Content outside tables (clamped at 0 without a max() call per metric)
+    diff = total_links - table_links
+    links_outside_tables = diff if diff > 0 else 0
+    diff = total_images - table_images
+    images_outside_tables = diff if diff > 0 else 0
+    diff = total_files - table_files
+    files_outside_tables = diff if diff > 0 else 0
+    diff = total_mentions - table_mentions
+    mentions_outside_tables = diff if diff > 0 else 0
     
-    # Calculate content metrics outside tables (excluding headings)
-    # word_count already excludes headings, word_count_excluding_tables excludes both headings and tables
-    words_outside_tables = doc_data.get('word_count_excluding_tables', 0)
-    
-    # Total document metrics
-    total_links = doc_data.get('link_count', 0)
-    total_images = doc_data.get('image_count', 0)
-    total_files = doc_data.get('file_ref_count', 0)
-    total_mentions = doc_data.get('mention_count', 0)
-    
-    # Table-specific metrics
-    table_links = doc_data.get('table_links_count', 0)
-    table_images = doc_data.get('table_images_count', 0)
-    table_files = doc_data.get('table_files_count', 0)
-    table_mentions = doc_data.get('table_mentions_count', 0)
-    
-    # Content outside tables
-    links_outside_tables = max(0, total_links - table_links)
-    images_outside_tables = max(0, total_images - table_images)
-    files_outside_tables = max(0, total_files - table_files)
-    mentions_outside_tables = max(0, total_mentions - table_mentions)
-    
-    # Track reasons for decision
+    # Track reasons for decision as unformatted (template, args) pairs;
+    # LazyReason renders them only if the reason string is consumed
     useful_indicators = []
-    
+
     # Check useful tables
     if has_useful_tables:
-        useful_indicators.append(f"{useful_table_count} useful table(s)")
-    
+        useful_indicators.append(("%d useful table(s)", useful_table_count))
+
     # Check words outside tables (excluding headings)
     if words_outside_tables >= WORDS_OUTSIDE_TABLES_THRESHOLD:
-        useful_indicators.append(f"{words_outside_tables} words outside tables (excl. headings)")
-    
+        useful_indicators.append(("%d words outside tables (excl. headings)", words_outside_tables))
+
     # Check links outside tables
     if links_outside_tables > 0:
-        useful_indicators.append(f"{links_outside_tables} link(s) outside tables")
-    
+        useful_indicators.append(("%d link(s) outside tables", links_outside_tables))
+
     # Check images outside tables
     if images_outside_tables > 0:
-        useful_indicators.append(f"{images_outside_tables} image(s) outside tables")
-    
+        useful_indicators.append(("%d image(s) outside tables", images_outside_tables))
+
     # Check file references outside tables
     if files_outside_tables > 0:
-        useful_indicators.append(f"{files_outside_tables} file reference(s) outside tables")
-    
+        useful_indicators.append(("%d file reference(s) outside tables", files_outside_tables))
+
     # Check user mentions outside tables
     if mentions_outside_tables > 0:
-        useful_indicators.append(f"{mentions_outside_tables} user mention(s) outside tables")
+        useful_indicators.append(("%d user mention(s) outside tables", mentions_outside_tables))
     
     # Decision logic
     is_gibberish = len(useful_indicators) == 0
     
-    decision_info = {
-        "is_gibberish": is_gibberish,
-        "useful_table_count": useful_table_count,
-        "gibberish_table_count": doc_data.get('gibberish_table_count', 0),
-        "total_tables": doc_data.get('num_tables', 0),
-        "words_outside_tables": words_outside_tables,
-        "links_outside_tables": links_outside_tables,
-        "images_outside_tables": images_outside_tables,
-        "files_outside_tables": files_outside_tables,
-        "mentions_outside_tables": mentions_outside_tables,
-        "useful_indicators": useful_indicators,
-        "reason": "No useful content found" if is_gibberish else f"Useful: {', '.join(useful_indicators)}"
-    }
-    
+    decision_info = PageDecisionInfo(
+        is_gibberish=is_gibberish,
+        useful_table_count=useful_table_count,
+        gibberish_table_count=get('gibberish_table_count', 0),
+        total_tables=get('num_tables', 0),
+        words_outside_tables=words_outside_tables,
+        links_outside_tables=links_outside_tables,
+        images_outside_tables=images_outside_tables,
+        files_outside_tables=files_outside_tables,
+        mentions_outside_tables=mentions_outside_tables,
+        useful_indicators=useful_indicators,
+        reason=LazyReason(is_gibberish, useful_indicators),
+    )
+
+    doc_data['_decision'] = (is_gibberish, decision_info)
     return is_gibberish, decision_info
 
 # =============================================================================
@@ -131,6 +259,10 @@ def main():
     Main function to analyze a page and display results.
     Usage: python page_decider.py [dump_file] [index]
     """
+    # Main-only import: collect pulls in the whole conversion/analysis stack,
+    # which library consumers of the decider functions don't need
+    from collect import collect_document_data
+
     # Accept command-line arguments: python page_decider.py [dump_file] [index]
     if len(sys.argv) >= 3:
         dump_file_name = sys.argv[1]
@@ -143,77 +275,68 @@ def main():
         index = DEFAULT_TEST_INDEX
         page_id = DEFAULT_TEST_PAGE_ID
 
-    with open(dump_file_name, "r", encoding="utf-8") as f:
-        for line_number, line in enumerate(f):
-            if line_number != index:
-                continue  # skip lines until the desired index
-
-            
-
-            data = json.loads(line)
-            doc_id = data.get("id")
-            doc_data = collect_document_data(data)
-
-            # print(f"Page {index}")
-            
-            # === PAGE-LEVEL ANALYSIS ===
-            print("="*80)
-            print("📄 PAGE ANALYSIS")
-            print(f"Page {index}")
-            print("="*80)
-            print(f"URL: {doc_data['url']}")
-            print(f"Title: {doc_data['title']}")
-            print(f"Document ID: {doc_id}")
-            
-            # Analyze page
-            page_is_gibberish, page_info = is_page_gibberish(doc_data)
-            page_status = "❌ GIBBERISH PAGE" if page_is_gibberish else "✅ USEFUL PAGE"
-            
-            print(f"\n{page_status}")
-            print(f"Decision: {page_info['reason']}")
-            print(f"\nPage Metrics:")
-            print(f"  📊 Tables:")
-            print(f"    • Total: {page_info['total_tables']}")
-            print(f"    • Useful: {page_info['useful_table_count']}")
-            print(f"    • Gibberish: {page_info['gibberish_table_count']}")
-            print(f"  📝 Content Outside Tables (excl. headings):")
-            print(f"    • Words: {page_info['words_outside_tables']}")
-            print(f"    • Links: {page_info['links_outside_tables']}")
-            print(f"    • Images: {page_info['images_outside_tables']}")
-            print(f"    • Files: {page_info['files_outside_tables']}")
-            print(f"    • Mentions: {page_info['mentions_outside_tables']}")
-            
-            # === TABLE-LEVEL ANALYSIS ===
-            tables = doc_data.get('tables', [])
-            if tables:
-                print(f"\n{'='*80}")
-                print(f"📋 TABLE DETAILS ({len(tables)} table(s))")
-                print(f"{'='*80}\n")
-                
-                for table in tables:
-                    table_index = table.get('table_index')
-                    is_gibberish, decision_info = is_table_gibberish(table.get('analysis', {}))
-                    status = "❌ Gibberish" if is_gibberish else "✅ Useful"
-                    
-                    print(f"Table {table_index} is {status}")
-                    print(f"  Decision: {decision_info['reason']}")
-                    print(f"  Metrics:")
-                    print(f"    • Meaningful Words: {decision_info['meaningful_words']} (excl. headings & placeholders)")
-                    print(f"    • Total Words: {decision_info['total_words']} (excl. headings)")
-                    print(f"    • Placeholder Words: {decision_info['placeholder_words']}")
-                    print(f"    • Links: {decision_info['links']}")
-                    print(f"    • Images: {decision_info['images']}")
-                    print(f"    • Files: {decision_info['files']}")
-                    print(f"    • Mentions: {decision_info['mentions']}")
-                    
-                    print("\n  Table Content:")
-                    for row in table.get('raw_table', []):
-                        print(f"    {row}")
-                    print("\n" + "="*80 + "\n")
-            else:
-                print(f"\n{'='*80}")
-                print(f"📋 No tables found in this document")
-                print(f"{'='*80}\n")
+    # Binary mode: skipped lines are never UTF-8 decoded, and islice
+    # advances the file iterator in C instead of a Python loop iteration
+    # per skipped line
+    with open(dump_file_name, "rb") as f:
+        line = next(islice(f, index, index + 1), None)
+    if line is None:
+        print(f"❌ No line found at index {index}")
+        return
+
+    data = _json.loads(line)
+    doc_id = data.get("id")
+    doc_data = collect_document_data(data)
+
+    # Buffer all lines and emit them with a single write instead of
+    # one print() (format + lock + write) per line
+    out = []
+
+    # === PAGE-LEVEL ANALYSIS ===
+    out.append(_SEPARATOR)
+    out.append("📄 PAGE ANALYSIS")
+    out.append(f"Page {index}")
+    out.append(_SEPARATOR)
+    out.append(f"URL: {doc_data['url']}")
+    out.append(f"Title: {doc_data['title']}")
+    out.append(f"Document ID: {doc_id}")
+
+    # Analyze page
+    page_is_gibberish, page_info = is_page_gibberish(doc_data)
+    page_status = _PAGE_STATUS[bool(page_is_gibberish)]
+
+    # Direct slot reads; the ['key'] shim costs a Python-level
+    # __getitem__ dispatch per field
+    out.append(f"\n{page_status}")
+    out.append(f"Decision: {page_info.reason}")
+    out.append(f"\nPage Metrics:")
+    out.append(f"  📊 Tables:")
+    out.append(f"    • Total: {page_info.total_tables}")
+    out.append(f"    • Useful: {page_info.useful_table_count}")
+    out.append(f"    • Gibberish: {page_info.gibberish_table_count}")
+    out.append(f"  📝 Content Outside Tables (excl. headings):")
+    out.append(f"    • Words: {page_info.words_outside_tables}")
+    out.append(f"    • Links: {page_info.links_outside_tables}")
+    out.append(f"    • Images: {page_info.images_outside_tables}")
+    out.append(f"    • Files: {page_info.files_outside_tables}")
+    out.append(f"    • Mentions: {page_info.mentions_outside_tables}")
+
+    # === TABLE-LEVEL ANALYSIS ===
+    tables = doc_data.get('tables', [])
+    if tables:
+        out.append("\n" + _SEPARATOR)
+        out.append(f"📋 TABLE DETAILS ({len(tables)} table(s))")
+        out.append(_SEPARATOR + "\n")
+
+        decisions = decide_tables(tables)
+        for table, (is_gibberish, decision_info) in zip(tables, decisions):
+            print_table_details(table, is_gibberish, decision_info, out=out)
+    else:
+        out.append("\n" + _SEPARATOR)
+        out.append(f"📋 No tables found in this document")
+        out.append(_SEPARATOR + "\n")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
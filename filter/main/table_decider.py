@@ -3,8 +3,19 @@ Table Gibberish Decider
 ========================
 Determines if a table contains gibberish or useful content based on meaningful content analysis.
 """
-import json
-from collect import collect_document_data
+import operator
+import sys
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, List
+
+import numpy as np
+
+# Prefer orjson's C parser for record decoding when available
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 # =============================================================================
 #                           CONFIGURATION PARAMETERS
@@ -14,10 +25,85 @@ DEFAULT_DATA_FILE = "/Users/rishabh.singh/Desktop/markdown_filter/filter/data/co
 DEFAULT_TEST_INDEX = 6687
 MEANINGFUL_WORDS_THRESHOLD = 3
 
+# Batch extraction of the numeric metrics read by is_table_gibberish:
+# one itemgetter call instead of seven .get() dispatches per table
+_METRIC_KEYS = ('meaningful_words', 'words', 'placeholder_words',
+                'links', 'images', 'files', 'mentions')
+_GET_METRICS = operator.itemgetter(*_METRIC_KEYS)
+
+# Per-table metrics block, compiled once as a %-template instead of
+# re-formatting eight f-strings per table
+_TABLE_METRICS_FMT = (
+    "  Decision: %s\n"
+    "  Metrics:\n"
+    "    • Meaningful Words: %d (excl. headings & placeholders)\n"
+    "    • Total Words: %d (excl. headings)\n"
+    "    • Placeholder Words: %d\n"
+    "    • Links: %d\n"
+    "    • Images: %d\n"
+    "    • Files: %d\n"
+    "    • Mentions: %d"
+)
+
+# Verdict-to-label lookup instead of a conditional expression per table
+_TABLE_STATUS = {True: "❌ Gibberish", False: "✅ Useful"}
+
+# Display separator built once instead of per print site
+_SEPARATOR = "=" * 80
+
 # =============================================================================
 #                           CORE FUNCTIONS
 # =============================================================================
 
+class LazyReason:
+    """
+    Lazily formatted decision reason.
+
+    Indicators arrive as (template, args) pairs; both the per-indicator
+    %-formatting and the ", ".join happen only when the reason is actually
+    printed (str/format), so batch callers that never read 'reason' pay
+    nothing for it.
+    """
+    __slots__ = ('is_gibberish', 'useful_indicators')
+
+    def __init__(self, is_gibberish, useful_indicators):
+        self.is_gibberish = is_gibberish
+        self.useful_indicators = useful_indicators
+
+    def __str__(self):
+        if self.is_gibberish:
+            return "No useful content found"
+        return f"Useful: {', '.join(t % a for t, a in self.useful_indicators)}"
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+@dataclass(slots=True)
+class TableDecisionInfo:
+    """
+    Decision breakdown for one table.
+
+    Slotted dataclass instead of a free-form dict: one table decision is
+    allocated per table per document, and slots keep the payload compact
+    with attribute access cheaper than dict lookups. Supports ['key']
+    subscripting for existing dict-style consumers.
+    """
+    is_gibberish: bool
+    meaningful_words: int
+    total_words: int
+    placeholder_words: int
+    links: int
+    images: int
+    files: int
+    mentions: int
+    useful_indicators: List[tuple]
+    reason: Any
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
 def is_table_gibberish(table_analysis):
     """
     Determine if a table is gibberish based on meaningful content (excluding headings and placeholders).
@@ -32,114 +118,219 @@ def is_table_gibberish(table_analysis):
     
     Returns:
         bool: True if gibberish, False if useful
-        dict: Decision breakdown with reasons
+        TableDecisionInfo: Decision breakdown with reasons
     """
     if not table_analysis:
-        return True, {"reason": "Empty or invalid table analysis"}
-    
+        return True, TableDecisionInfo(
+            is_gibberish=True,
+            meaningful_words=0, total_words=0, placeholder_words=0,
+            links=0, images=0, files=0, mentions=0,
+            useful_indicators=[],
+            reason="Empty or invalid table analysis",
+        )
+
+    # Bind the bound method once instead of re-resolving table_analysis.get per read
+    get = table_analysis.get
+
+    # Memoized: the decision is a pure function of the analysis dict, so
+    # callers that decide the same table more than once (e.g. counting then
+    # displaying) reuse the cached result instead of re-deriving it
+    cached = get('_decision')
+    if cached is not None:
+        return cached
+
     # Extract metrics (all exclude headings and placeholders)
-    meaningful_words = table_analysis.get('meaningful_words', 0)
-    total_words = table_analysis.get('words', 0)
-    placeholder_words = table_analysis.get('placeholder_words', 0)
-    links = table_analysis.get('links', 0)
-    images = table_analysis.get('images', 0)
-    files = table_analysis.get('files', 0)
-    mentions = table_analysis.get('mentions', 0)
-    is_useful = table_analysis.get('is_useful_table', False)
+    try:
+        (meaningful_words, total_words, placeholder_words,
+         links, images, files, mentions) = _GET_METRICS(table_analysis)
+    except KeyError:
+        # Partial analysis dict (shouldn't happen for analyze_table_content output)
+        (meaningful_words, total_words, placeholder_words,
+         links, images, files, mentions) = (get(k, 0) for k in _METRIC_KEYS)
+    is_useful = get('is_useful_table', False)
     
-    # Track reasons for decision
+    # Track reasons for decision as unformatted (template, args) pairs;
+    # LazyReason renders them only if the reason string is consumed
     useful_indicators = []
-    
+
     # Check meaningful words (excludes headings and placeholders)
     if meaningful_words >= MEANINGFUL_WORDS_THRESHOLD:
-        useful_indicators.append(f"{meaningful_words} meaningful words (excl. headings & placeholders)")
-    
+        useful_indicators.append(("%d meaningful words (excl. headings & placeholders)", meaningful_words))
+
     # Check links
     if links > 0:
-        useful_indicators.append(f"{links} link(s)")
-    
+        useful_indicators.append(("%d link(s)", links))
+
     # Check images
     if images > 0:
-        useful_indicators.append(f"{images} image(s)")
-    
+        useful_indicators.append(("%d image(s)", images))
+
     # Check file references
     if files > 0:
-        useful_indicators.append(f"{files} file reference(s)")
-    
+        useful_indicators.append(("%d file reference(s)", files))
+
     # Check user mentions
     if mentions > 0:
-        useful_indicators.append(f"{mentions} user mention(s)")
-    
+        useful_indicators.append(("%d user mention(s)", mentions))
+
     # Check pre-computed flag
     if is_useful:
-        useful_indicators.append("pre-computed useful flag")
+        useful_indicators.append(("pre-computed useful flag", ()))
     
     # Decision logic
     is_gibberish = len(useful_indicators) == 0
     
-    decision_info = {
-        "is_gibberish": is_gibberish,
-        "meaningful_words": meaningful_words,
-        "total_words": total_words,
-        "placeholder_words": placeholder_words,
-        "links": links,
-        "images": images,
-        "files": files,
-        "mentions": mentions,
-        "useful_indicators": useful_indicators,
-        "reason": "No useful content found" if is_gibberish else f"Useful: {', '.join(useful_indicators)}"
-    }
-    
+    decision_info = TableDecisionInfo(
+        is_gibberish=is_gibberish,
+        meaningful_words=meaningful_words,
+        total_words=total_words,
+        placeholder_words=placeholder_words,
+        links=links,
+        images=images,
+        files=files,
+        mentions=mentions,
+        useful_indicators=useful_indicators,
+        reason=LazyReason(is_gibberish, useful_indicators),
+    )
+
+    table_analysis['_decision'] = (is_gibberish, decision_info)
     return is_gibberish, decision_info
 
+def batch_is_table_gibberish(analyses):
+    """
+    Vectorized verdict-only decision for a batch of table analyses.
+
+    Stacks each table's scalar metrics into numpy arrays and evaluates the
+    usefulness predicate across all tables in one shot, skipping the
+    per-table indicator/reason bookkeeping. Matches is_table_gibberish()'s
+    verdict for every table; use decide_tables() when the breakdown is needed.
+
+    Args:
+        analyses: List of table analysis dicts from analyze_table_content()
+
+    Returns:
+        List of bools, True where the table is gibberish
+    """
+    if not analyses:
+        return []
+
+    n = len(analyses)
+    mw = np.fromiter((a.get('meaningful_words', 0) for a in analyses), dtype=np.int64, count=n)
+    links = np.fromiter((a.get('links', 0) for a in analyses), dtype=np.int64, count=n)
+    images = np.fromiter((a.get('images', 0) for a in analyses), dtype=np.int64, count=n)
+    files = np.fromiter((a.get('files', 0) for a in analyses), dtype=np.int64, count=n)
+    mentions = np.fromiter((a.get('mentions', 0) for a in analyses), dtype=np.int64, count=n)
+    useful_flag = np.fromiter((bool(a.get('is_useful_table', False)) for a in analyses), dtype=bool, count=n)
+
+    useful = (
+        (mw >= MEANINGFUL_WORDS_THRESHOLD)
+        | (links > 0) | (images > 0) | (files > 0) | (mentions > 0)
+        | useful_flag
+    )
+    return (~useful).tolist()
+
+
+def decide_tables(tables):
+    """
+    Decide every table on a page exactly once.
+
+    Precomputes the gibberish decision for a page's tables so callers that
+    need the decisions in several places (counts, per-table display) don't
+    re-run the analysis per use.
+
+    Args:
+        tables: List of table summary dicts from collect_document_data()
+
+    Returns:
+        List of (is_gibberish, decision_info) tuples, one per table
+    """
+    return [is_table_gibberish(table.get('analysis', {})) for table in tables]
+
+def print_table_details(table, is_gibberish, decision_info, out=None):
+    """
+    Print the per-table display block (status, metrics, raw content).
+
+    Shared by the table- and page-decider mains, which previously carried
+    identical copies of this block.
+
+    Args:
+        table: Table summary dict from collect_document_data()
+        is_gibberish: Verdict for the table
+        decision_info: TableDecisionInfo for the table
+        out: Optional line buffer; when given, lines are appended to it
+            instead of written, so the caller can flush everything in one
+            stdout write
+    """
+    lines = [] if out is None else out
+    table_index = table.get('table_index')
+    status = _TABLE_STATUS[bool(is_gibberish)]
+
+    lines.append(f"Table {table_index} is {status}")
+    # Direct slot reads; the ['key'] shim costs a Python-level
+    # __getitem__ dispatch per field
+    lines.append(_TABLE_METRICS_FMT % (
+        decision_info.reason,
+        decision_info.meaningful_words,
+        decision_info.total_words,
+        decision_info.placeholder_words,
+        decision_info.links,
+        decision_info.images,
+        decision_info.files,
+        decision_info.mentions,
+    ))
+
+    lines.append("\n  Table Content:")
+    for row in table.get('raw_table', []):
+        lines.append(f"    {row}")
+    lines.append("\n" + _SEPARATOR + "\n")
+
+    if out is None:
+        sys.stdout.write("\n".join(lines) + "\n")
+
 # =============================================================================
 #                           MAIN EXECUTION
 # =============================================================================
 
 def main():
+    # Main-only import: collect pulls in the whole conversion/analysis stack,
+    # which library consumers of the decider functions don't need
+    from collect import collect_document_data
+
     index = DEFAULT_TEST_INDEX
     dump_file_name = DEFAULT_DATA_FILE
 
-    with open(dump_file_name, "r", encoding="utf-8") as f:
-        for line_number, line in enumerate(f):
-            if line_number != index:
-                continue  # skip lines until the desired index
-
-            data = json.loads(line)
-            doc_id = data.get("id")
-            doc_data = collect_document_data(data)
-            print(f"URL: {doc_data['url']}")
-            print(f"Title: {doc_data['title']}")
-
-            tables = doc_data.get('tables', [])
-            if not tables:
-                print(f"Document {doc_id} has no tables.")
-                continue
-
-            print(f"\nDocument {doc_id} contains {len(tables)} table(s):")
-            print(f"Useful Tables: {doc_data.get('useful_table_count', 0)}")
-            print(f"Gibberish Tables: {doc_data.get('gibberish_table_count', 0)}\n")
-            
-            for table in tables:
-                table_index = table.get('table_index')
-                is_gibberish, decision_info = is_table_gibberish(table.get('analysis', {}))
-                status = "❌ Gibberish" if is_gibberish else "✅ Useful"
-                
-                print(f"Table {table_index} is {status}")
-                print(f"  Decision: {decision_info['reason']}")
-                print(f"  Metrics:")
-                print(f"    • Meaningful Words: {decision_info['meaningful_words']} (excl. headings & placeholders)")
-                print(f"    • Total Words: {decision_info['total_words']} (excl. headings)")
-                print(f"    • Placeholder Words: {decision_info['placeholder_words']}")
-                print(f"    • Links: {decision_info['links']}")
-                print(f"    • Images: {decision_info['images']}")
-                print(f"    • Files: {decision_info['files']}")
-                print(f"    • Mentions: {decision_info['mentions']}")
-                
-                print("\n  Table Content:")
-                for row in table.get('raw_table', []):
-                    print(f"    {row}")
-                print("\n" + "="*80 + "\n")
+    # Binary mode: skipped lines are never UTF-8 decoded, and islice
+    # advances the file iterator in C instead of a Python loop iteration
+    # per skipped line
+    with open(dump_file_name, "rb") as f:
+        line = next(islice(f, index, index + 1), None)
+    if line is None:
+        print(f"❌ No line found at index {index}")
+        return
+
+    data = _json.loads(line)
+    doc_id = data.get("id")
+    doc_data = collect_document_data(data)
+
+    # Buffer all lines and emit them with a single write instead of
+    # one print() (format + lock + write) per line
+    out = []
+    out.append(f"URL: {doc_data['url']}")
+    out.append(f"Title: {doc_data['title']}")
+
+    tables = doc_data.get('tables', [])
+    if not tables:
+        out.append(f"Document {doc_id} has no tables.")
+    else:
+        out.append(f"\nDocument {doc_id} contains {len(tables)} table(s):")
+        out.append(f"Useful Tables: {doc_data.get('useful_table_count', 0)}")
+        out.append(f"Gibberish Tables: {doc_data.get('gibberish_table_count', 0)}\n")
+
+        decisions = decide_tables(tables)
+        for table, (is_gibberish, decision_info) in zip(tables, decisions):
+            print_table_details(table, is_gibberish, decision_info, out=out)
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":